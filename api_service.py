@@ -1,20 +1,28 @@
+import hashlib
 import logging
+import os
+import orjson
 import uvicorn
 
 from typing import Annotated
-from fastapi import FastAPI, Depends, Path
+from fastapi import FastAPI, Depends, Path, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
-from agent_support.entities import ListSessionsRequest
-from agent_support.config import ServiceConfig
-from agent_support import AgentSupportService
-from agent_support.auth import get_current_user
+# Load .env once, before any module below reads the environment at import time
+if not os.environ.get("DOTENV_LOADED"):
+    load_dotenv()
+    os.environ["DOTENV_LOADED"] = "1"
 
-from service import LogConfig, AgentSupportServiceMetadata
+from agent_support.entities import ListSessionsRequest  # noqa: E402
+from agent_support.config import ServiceConfig  # noqa: E402
+from agent_support import AgentSupportService  # noqa: E402
+from agent_support.auth import get_current_user  # noqa: E402
+
+from service import LogConfig, AgentSupportServiceMetadata  # noqa: E402
 
-load_dotenv()
 log_config = LogConfig().log_config
 logging.config.dictConfig(log_config)
 
@@ -29,6 +37,7 @@ app = FastAPI(
     version=AgentSupportServiceMetadata.version,
     openapi_tags=AgentSupportServiceMetadata.tags,
     docs_url=AgentSupportServiceMetadata.enable_docs_url,
+    default_response_class=ORJSONResponse,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -37,19 +46,28 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=AgentSupportServiceMetadata.gzip_minimum_size,
+    compresslevel=AgentSupportServiceMetadata.gzip_compress_level,
+)
 agent_support_service = AgentSupportService()
 
+# Config is immutable for the process lifetime, so serialise it once
+_CONFIG_JSON_BYTES = orjson.dumps(ServiceConfig.get_or_create_instance().public_config)
+_CONFIG_ETAG = f'"{hashlib.sha1(_CONFIG_JSON_BYTES).hexdigest()}"'
+
 
 @app.post("/agent-support/v1/sessions/list", tags=["Data"])
 async def list_user_sessions(
     request: ListSessionsRequest, user: dict = Depends(get_current_user)
 ) -> dict:
     logger.debug(
-        f"[API: agent-sessions] Received list agent sessions request for user: {user.get('user_id')}"
+        "[API: agent-sessions] Received list agent sessions request for user: %s",
+        user.get("user_id"),
     )
     response = await agent_support_service.list_sessions(request, user.get("user_id"))
-    logger.debug(f"[API: agent-sessions] Returning results for request: {response}")
+    logger.debug("[API: agent-sessions] Returning results for request: %s", response)
     return response
 
 
@@ -59,19 +77,26 @@ async def get_user_session(
     user: dict = Depends(get_current_user),
 ) -> dict:
     logger.debug(
-        f"[API: agent-sessions] Received get session {session_id} for user: {user.get('user_id')}"
+        "[API: agent-sessions] Received get session %s for user: %s",
+        session_id,
+        user.get("user_id"),
     )
     response = await agent_support_service.get_session(session_id, user.get("user_id"))
-    logger.debug(f"[API: agent-sessions] Returning results for request: {response}")
+    logger.debug("[API: agent-sessions] Returning results for request: %s", response)
     return response
 
 
 @app.get("/agent-support/v1/config", tags=["Configuration"])
-async def config_request() -> dict:
+async def config_request(request: Request) -> Response:
     logger.debug("[API: Config] Received config request")
-    response = ServiceConfig.get_or_create_instance().config[0][0]
-    logger.debug(f"[API: Config] Returning results for request: {response}")
-    return response
+    if request.headers.get("If-None-Match") == _CONFIG_ETAG:
+        return Response(status_code=304, headers={"ETag": _CONFIG_ETAG})
+    logger.debug("[API: Config] Returning results for request: %s", _CONFIG_JSON_BYTES)
+    return Response(
+        content=_CONFIG_JSON_BYTES,
+        media_type="application/json",
+        headers={"ETag": _CONFIG_ETAG},
+    )
 
 
 if __name__ == "__main__":
@@ -18,6 +18,8 @@ class AgentSupportServiceMetadata:
             "description": "APIs used for reading service configuration",
         },
     ]
+    gzip_minimum_size = int(os.environ.get("GZIP_MINIMUM_SIZE", "500"))
+    gzip_compress_level = int(os.environ.get("GZIP_COMPRESS_LEVEL", "6"))
     enable_docs_url = (
         "/docs" if os.environ.get("LOG_LEVEL", "INFO") == "DEBUG" else None
     )
@@ -2,6 +2,8 @@ import os
 
 import yamale
 
+from agent_support.utils import source_mtimes, read_mtime_cache, write_mtime_cache
+
 
 class LogConfig:
     log_config: dict
@@ -11,7 +13,13 @@ class LogConfig:
 
     @staticmethod
     def _load_log_config() -> dict:
-        log_config = yamale.make_data(os.environ.get("LOG_CONFIG"))[0][0]
+        path = os.environ.get("LOG_CONFIG")
+        cache_path = f"{path}.cache"
+        mtimes = source_mtimes(path)
+        log_config = read_mtime_cache(cache_path, mtimes)
+        if log_config is None:
+            log_config = yamale.make_data(path)[0][0]
+            write_mtime_cache(cache_path, mtimes, log_config)
         log_config["loggers"]["uvicorn"]["level"] = os.environ.get("LOG_LEVEL", "INFO")
         log_config["root"]["level"] = os.environ.get("LOG_LEVEL", "INFO")
         return log_config
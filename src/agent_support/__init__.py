@@ -1,12 +1,8 @@
 import logging
 
-from dotenv import load_dotenv
-
 from .config import ServiceConfig
 from .support_services import AgentSupportService
 
-load_dotenv()
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 __version__ = "0.0.0"
@@ -16,4 +12,8 @@ __all__ = ["AgentSupportService"]
 
 
 def main() -> None:
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
     logger.info(ServiceConfig.get_or_create_instance().config)
@@ -1,23 +1,81 @@
-import os
+import asyncio
+import hashlib
 import logging
-import firebase_admin as fba
+import re
+import time
 
+import httpx
+import jwt
+
+from cachetools import TLRUCache
+from cryptography.x509 import load_pem_x509_certificate
 from fastapi import Request, HTTPException, Depends
-from firebase_admin import auth
+from ..config import ServiceConfig
 from ..utils import Constants
 
 logger = logging.getLogger(Constants.UVICORN)
 
+_GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+_MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+_TOKEN_CACHE_MAX_TTL = 60
+
+
+def _token_ttu(_key: bytes, decoded_token: dict, now: float) -> float:
+    # Never serve a token past its own expiry, and never cache longer than the ceiling
+    return min(decoded_token["exp"], now + _TOKEN_CACHE_MAX_TTL)
+
+
+_TOKEN_CACHE: TLRUCache = TLRUCache(maxsize=10_000, ttu=_token_ttu, timer=time.time)
+
+
+class _PublicKeyCache:
+    """
+    Holds Google's securetoken signing keys keyed by ``kid``. Keys are fetched
+    with a shared ``httpx.AsyncClient`` and refreshed once the ``max-age`` from
+    the response's ``Cache-Control`` header has elapsed.
+    """
+
+    def __init__(self, url: str):
+        self._url = url
+        self._keys: dict = {}
+        self._expires_at = 0.0
+        self._lock = asyncio.Lock()
+        self._client: httpx.AsyncClient | None = None
+
+    async def get(self, kid: str):
+        if time.time() >= self._expires_at:
+            await self._refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"No public key found for kid: {kid}")
+        return key
+
+    async def _refresh(self) -> None:
+        async with self._lock:
+            if time.time() < self._expires_at:
+                return
+            if self._client is None:
+                self._client = httpx.AsyncClient(timeout=10.0)
+            response = await self._client.get(self._url)
+            response.raise_for_status()
+            self._keys = {
+                kid: load_pem_x509_certificate(pem.encode()).public_key()
+                for kid, pem in response.json().items()
+            }
+            match = _MAX_AGE_PATTERN.search(response.headers.get("Cache-Control", ""))
+            max_age = int(match.group(1)) if match else 0
+            self._expires_at = time.time() + max_age
+            logger.debug("Refreshed %d Firebase public keys", len(self._keys))
+
+
+_PUBLIC_KEYS = _PublicKeyCache(_GOOGLE_CERTS_URL)
+
 
 class HobuBackend:
     _instance = None
-    creds = os.getenv("GOOGLE_APPLICATION_CREDENTIALS", None)
-    if not creds:
-        logger.info("GOOGLE_APPLICATION_CREDENTIALS not set; relying on ADC.")
-    else:
-        logger.info(f"GOOGLE_APPLICATION_CREDENTIALS set; using credentials: {creds}")
-
-    app = fba.initialize_app()
 
     @staticmethod
     async def authenticate(request: Request):
@@ -29,11 +87,46 @@ class HobuBackend:
 
         try:
             token = token.replace("Bearer ", "")
-            decoded_token = auth.verify_id_token(token)
+            key = hashlib.sha256(token.encode()).digest()
+            decoded_token = _TOKEN_CACHE.get(key)
+            if decoded_token is not None and decoded_token["exp"] > time.time():
+                return decoded_token
+
+            decoded_token = await HobuBackend._verify_id_token(token)
+            _TOKEN_CACHE[key] = decoded_token
             return decoded_token
         except Exception as e:
             raise HTTPException(status_code=401, detail=str(e))
 
+    @staticmethod
+    async def _verify_id_token(token: str) -> dict:
+        """
+        Verifies a Firebase ID token against Google's published public keys,
+        mirroring the checks performed by ``firebase_admin.auth.verify_id_token``
+        without blocking the event loop.
+
+        :param token: Raw Firebase ID token.
+        :type token: str
+        :raises jwt.InvalidTokenError: Raised if the signature or any claim is invalid.
+        :return: The decoded token claims, with ``uid`` set to the token subject.
+        :rtype: dict
+        """
+        project_id = ServiceConfig.get_or_create_instance().firebase["project"]
+        kid = jwt.get_unverified_header(token)["kid"]
+        public_key = await _PUBLIC_KEYS.get(kid)
+        decoded_token = jwt.decode(
+            token,
+            public_key,
+            algorithms=["RS256"],
+            audience=project_id,
+            issuer=f"https://securetoken.google.com/{project_id}",
+            options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+        )
+        if not decoded_token["sub"]:
+            raise jwt.InvalidTokenError("Token has an empty subject")
+        decoded_token["uid"] = decoded_token["sub"]
+        return decoded_token
+
 
 def get_current_user(token: dict = Depends(HobuBackend.authenticate)):
     return token
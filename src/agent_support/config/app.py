@@ -1,9 +1,16 @@
+import json
 import logging
 import os
 
+import fastjsonschema
 import yamale
 
-from ..utils import EnvironmentVariableNotFound
+from ..utils import (
+    EnvironmentVariableNotFound,
+    source_mtimes,
+    read_mtime_cache,
+    write_mtime_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +18,9 @@ logger = logging.getLogger(__name__)
 class ServiceConfig:
 
     _instance = None
+    _validator = None
     config: dict
+    public_config: dict
     firebase: dict
     appName: str
 
@@ -35,19 +44,29 @@ class ServiceConfig:
 
     def __init__(self):
         try:
+            schema_path = self._config_path_from_env("CONFIG_SCHEMA_PATH")
             logger.info(
-                f"Reading Config Schema from env variable 'CONFIG_SCHEMA_PATH' which is set to: {os.environ.get('CONFIG_SCHEMA_PATH')}"
+                f"Reading Config Schema from env variable 'CONFIG_SCHEMA_PATH' which is set to: {schema_path}"
             )
+            self.path = self._config_path_from_env("CONFIG_PATH")
             logger.info(
-                f"Reading Config from env variable 'CONFIG_PATH' which is set to: {os.environ.get('CONFIG_PATH')}"
+                f"Reading Config from env variable 'CONFIG_PATH' which is set to: {self.path}"
             )
             logger.info("Reading config and validating schema...")
-            self.path = self._check_if_config_exists()
-            schema = yamale.make_schema(os.environ.get("CONFIG_SCHEMA_PATH"))
-            self.config = yamale.make_data(self.path)
-            yamale.validate(schema, self.config)
-            logger.info("Schema validation success! 👍")
-            self._set_default_config_class_attributes(self.config[0][0].get("service"))
+            # Stat-ing the files also raises FileNotFoundError if either is missing
+            cache_path = f"{self.path}.cache"
+            mtimes = source_mtimes(self.path, schema_path)
+            cached_config = read_mtime_cache(cache_path, mtimes)
+            if cached_config is not None:
+                self.config = [(cached_config, self.path)]
+                logger.info("Config unchanged since last validation, using cache 👍")
+            else:
+                self.config = yamale.make_data(self.path)
+                self._get_validator(schema_path)(self.config[0][0])
+                logger.info("Schema validation success! 👍")
+                write_mtime_cache(cache_path, mtimes, self.config[0][0])
+            self.public_config = self.config[0][0]
+            self._set_default_config_class_attributes(self.public_config.get("service"))
         except ValueError as e:
             logger.error(f"Schema Validation failed!\n{str(e)}")
             exit(1)
@@ -55,31 +74,40 @@ class ServiceConfig:
             logger.error(f"Error occurred during schema validation\n{str(ge)}")
             exit(1)
 
+    @classmethod
+    def _get_validator(cls, schema_path: str):
+        """
+        Compiles the JSON schema found at ``schema_path`` into a validation
+        function. The compiled validator is kept on the class so that every
+        subsequent validation reuses it.
+
+        :param schema_path: Path to the JSON schema describing the service config.
+        :type schema_path: str
+        :return: A callable raising ``JsonSchemaValueException`` on invalid data.
+        """
+        if cls._validator is None:
+            with open(schema_path, "r", encoding="utf-8") as f:
+                cls._validator = fastjsonschema.compile(json.load(f))
+        return cls._validator
+
     @staticmethod
-    def _check_if_config_exists():
+    def _config_path_from_env(env_var: str = "CONFIG_PATH") -> str:
         """
-        Checks if the configuration file exists in the path specified by the
-        environment variable "CONFIG_PATH". The method first verifies if the
-        environment variable "CONFIG_PATH" is set. If it is set, it checks
-        whether the path exists in the file system. Raises specific errors
-        if configurations are not found or if the file path is invalid.
+        Resolves a configuration file path from the given environment variable.
+        The path is not checked here: the ``os.stat`` that reads the file's mtime
+        for the config cache key raises ``FileNotFoundError`` if it is missing.
 
-        :raises EnvironmentVariableNotFound: Raised if the "CONFIG_PATH"
-            environment variable is not set.
-        :raises FileNotFoundError: Raised if the file path specified in
-            "CONFIG_PATH" does not exist.
-        :return: The configuration file path if it exists.
+        :param env_var: Name of the environment variable holding the path.
+        :type env_var: str
+        :raises EnvironmentVariableNotFound: Raised if the environment variable
+            is not set.
+        :return: The configuration file path.
         :rtype: str
         """
-        if os.environ.get("CONFIG_PATH") is not None:
-            if os.path.exists(os.environ.get("CONFIG_PATH")):
-                return os.environ.get("CONFIG_PATH")
-            else:
-                raise FileNotFoundError(
-                    f"{os.environ.get('CONFIG_PATH')} is not a file"
-                )
-        else:
-            raise EnvironmentVariableNotFound("CONFIG_PATH")
+        path = os.environ.get(env_var)
+        if path is None:
+            raise EnvironmentVariableNotFound(env_var)
+        return path
 
     def _set_default_config_class_attributes(self, defaults: dict):
         """
@@ -0,0 +1,110 @@
+"""
+One-off backfill that rewrites event ``actions`` stored as pickled bytes (the
+format used before actions were stored as Firestore maps) into the map written
+by ``FirestoreSessionService._event_to_doc``.
+
+The request path never unpickles stored data; this script is meant to be run
+once by an operator, against a Firestore database written only by this
+service::
+
+    python -m agent_support.storage.backfill_actions --dry-run
+    python -m agent_support.storage.backfill_actions
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import pickle
+
+from google.adk.events.event_actions import EventActions
+from google.cloud.firestore_v1 import AsyncClient
+
+from ..config import ServiceConfig
+from .firestore import _MAX_BATCH_WRITES, _safe_model_dump
+
+logger = logging.getLogger(__name__)
+
+
+def _unpickle_actions(raw: bytes) -> dict:
+    actions = pickle.loads(raw)
+    if not isinstance(actions, EventActions):
+        raise TypeError(f"Unexpected pickled type: {type(actions).__name__}")
+    actions_json = _safe_model_dump(actions)
+    if actions_json is None:
+        raise ValueError("Unpickled actions could not be serialised")
+    return actions_json
+
+
+async def backfill_pickled_actions(dry_run: bool = False) -> tuple[int, int]:
+    """
+    Rewrites every pickled ``actions`` field in the configured sessions
+    collection as a native Firestore map.
+
+    :param dry_run: Only count the events that would be rewritten.
+    :type dry_run: bool
+    :return: Number of events rewritten (or to rewrite) and number that failed
+        to unpickle and were left untouched.
+    :rtype: tuple[int, int]
+    """
+    config = ServiceConfig.get_or_create_instance()
+    client = AsyncClient(database=config.firebase["database"])
+    col_sessions = client.collection(config.firebase["collection"])
+
+    rewritten = failed = 0
+    batch, pending = client.batch(), 0
+    async for session_snap in col_sessions.select([]).stream():
+        events_col = session_snap.reference.collection("events")
+        async for event_snap in events_col.select(["actions"]).stream():
+            raw = (event_snap.to_dict() or {}).get("actions")
+            if not isinstance(raw, (bytes, bytearray)):
+                continue
+            try:
+                actions_json = _unpickle_actions(bytes(raw))
+            except Exception:
+                logger.exception(
+                    "Could not unpickle actions of %s", event_snap.reference.path
+                )
+                failed += 1
+                continue
+            rewritten += 1
+            if dry_run:
+                continue
+            batch.update(event_snap.reference, {"actions": actions_json})
+            pending += 1
+            if pending == _MAX_BATCH_WRITES:
+                await batch.commit()
+                batch, pending = client.batch(), 0
+        logger.info("Processed session %s", session_snap.id)
+    if pending:
+        await batch.commit()
+    return rewritten, failed
+
+
+def main() -> None:
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(
+        description="Rewrite pickled event actions as Firestore maps."
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="count the events that would be rewritten without writing",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO)
+    rewritten, failed = asyncio.run(backfill_pickled_actions(dry_run=args.dry_run))
+    logger.info(
+        "%s %d events with pickled actions; %d could not be unpickled",
+        "Found" if args.dry_run else "Rewrote",
+        rewritten,
+        failed,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import pickle
 import base64
-import json
+import struct
 
 from datetime import datetime, timezone, timedelta
+from functools import lru_cache, partial
 from typing import Any, Dict, Optional
 from uuid import uuid4
 
+from cachetools import TTLCache
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import firestore
 from google.adk.events.event import Event
 from google.adk.events.event_actions import EventActions
@@ -27,9 +30,17 @@ from typing_extensions import override
 
 from ..config import ServiceConfig
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Firestore rejects batched writes with more than 500 operations
+_MAX_BATCH_WRITES = 500
+# Session fields needed to build the list view
+_LIST_SESSION_FIELDS = ["id", "update_time", "state"]
+# Page token layout: update time (float64), session id kind (uint8), session id bytes
+_PAGE_TOKEN_HEADER = struct.Struct("<dB")
+_SID_HEX = 0
+_SID_UTF8 = 1
+
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
@@ -37,23 +48,40 @@ def _now_utc() -> datetime:
 
 def _safe_model_dump(obj) -> Dict[str, Any] | None:
     try:
-        return obj.model_dump(exclude_none=True, mode="json")
+        # Same output as model_dump, without the Python-level wrapper around the
+        # compiled pydantic-core serializer
+        return obj.__pydantic_serializer__.to_python(
+            obj, exclude_none=True, mode="json"
+        )
     except Exception:
         return None
 
 
 def _encode_page_token(session_id: str, update_dt: datetime) -> str:
-    payload = {"sid": session_id, "ut": update_dt.timestamp()}
-    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-    return base64.urlsafe_b64encode(raw).decode("utf-8")
+    kind, sid_bytes = _SID_UTF8, session_id.encode("utf-8")
+    if len(session_id) == 32:
+        # uuid4().hex ids pack into 16 raw bytes
+        try:
+            raw_sid = bytes.fromhex(session_id)
+            if raw_sid.hex() == session_id:
+                kind, sid_bytes = _SID_HEX, raw_sid
+        except ValueError:
+            pass
+    raw = _PAGE_TOKEN_HEADER.pack(update_dt.timestamp(), kind) + sid_bytes
+    return base64.urlsafe_b64encode(raw).decode("ascii")
 
 
 def _decode_page_token(token: str) -> tuple[datetime, str] | None:
     try:
-        raw = base64.urlsafe_b64decode(token.encode("utf-8")).decode("utf-8")
-        payload = json.loads(raw)
-        ts = float(payload["ut"])
-        sid = str(payload["sid"])
+        raw = base64.urlsafe_b64decode(token.encode("ascii"))
+        ts, kind = _PAGE_TOKEN_HEADER.unpack_from(raw)
+        sid_bytes = raw[_PAGE_TOKEN_HEADER.size :]
+        if kind == _SID_HEX:
+            sid = sid_bytes.hex()
+        elif kind == _SID_UTF8:
+            sid = sid_bytes.decode("utf-8")
+        else:
+            raise ValueError(f"Unknown session id kind: {kind}")
         return datetime.fromtimestamp(ts, tz=timezone.utc), sid
     except Exception:
         logger.warning("Invalid page_token; starting from the beginning.")
@@ -70,6 +98,18 @@ class FirestoreSessionService(BaseSessionService):
             logger.info("GOOGLE_APPLICATION_CREDENTIALS not set; relying on ADC.")
         self.client: AsyncClient = AsyncClient(database=config.firebase["database"])
         self.col_sessions = self.client.collection(config.firebase["collection"])
+        # In-flight session creates by document id; also keeps the tasks referenced
+        self._pending_creates: dict[str, asyncio.Task] = {}
+        # Events subcollection references by session document id
+        self._events_col = lru_cache(maxsize=10_000)(self._new_events_col)
+        # First page of list_sessions by (app_name, user_id, page_size), to absorb
+        # bursts of identical requests. Session writes normally happen in the
+        # agent's process, which has its own cache, so staleness here is bounded
+        # only by the 3s TTL. Writes through this instance still drop their
+        # user's entries.
+        self._list_cache: TTLCache = TTLCache(maxsize=2048, ttl=3)
+        # Sessions already warned about legacy pickled actions, to log once an hour
+        self._legacy_actions_warned: TTLCache = TTLCache(maxsize=10_000, ttl=3600)
         logger.info(
             "FirestoreSessionService initialised (project=%s)", self.client.project
         )
@@ -81,6 +121,62 @@ class FirestoreSessionService(BaseSessionService):
     def _generate_id() -> str:
         return uuid4().hex
 
+    def _session_ref(self, app_name: str, user_id: str, session_id: str):
+        return self.col_sessions.document(":".join((app_name, user_id, session_id)))
+
+    def _warn_legacy_actions(self, session_id: Optional[str]) -> None:
+        if session_id in self._legacy_actions_warned:
+            return
+        self._legacy_actions_warned[session_id] = True
+        logger.warning(
+            "Session %s has events with legacy pickled actions; they are not "
+            "unpickled, so their state_delta and other actions are dropped; run "
+            "python -m agent_support.storage.backfill_actions to migrate them",
+            session_id,
+        )
+
+    def _invalidate_list_cache(self, app_name: str, user_id: str) -> None:
+        stale = [k for k in self._list_cache if k[0] == app_name and k[1] == user_id]
+        for key in stale:
+            self._list_cache.pop(key, None)
+
+    def _new_events_col(self, session_doc_id: str):
+        return self.col_sessions.document(session_doc_id).collection("events")
+
+    @staticmethod
+    def _new_session_doc(
+        app_name: str, user_id: str, sid: str, state: dict[str, Any], now: datetime
+    ) -> Dict[str, Any]:
+        return {
+            "app_name": app_name,
+            "user_id": user_id,
+            "id": sid,
+            "state": state,
+            "create_time": now,
+            "update_time": now,
+            "ttl": now + timedelta(days=180),
+        }
+
+    async def _create_session_doc(self, doc_ref, session_doc: Dict[str, Any]) -> None:
+        try:
+            await doc_ref.create(session_doc)
+        except AlreadyExists:
+            logger.debug("Session %s was created concurrently", doc_ref.id)
+
+    def _forget_pending_create(self, doc_id: str, task: asyncio.Task) -> None:
+        # A newer create for the same session may have replaced this one
+        if self._pending_creates.get(doc_id) is task:
+            del self._pending_creates[doc_id]
+
+    def _on_create_done(self, doc_id: str, task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            self._forget_pending_create(doc_id, task)
+            return
+        # Keep the failed task so the next append_event re-raises its error
+        logger.error(
+            "Failed to create session %s", doc_id, exc_info=task.exception()
+        )
+
     @override
     async def create_session(
         self,
@@ -93,7 +189,7 @@ class FirestoreSessionService(BaseSessionService):
         now = _now_utc()
         # Use provided session_id or generate one
         sid = session_id or self._generate_id()
-        doc_ref = self.col_sessions.document(f"{app_name}:{user_id}:{sid}")
+        doc_ref = self._session_ref(app_name, user_id, sid)
         if state:
             filtered_state = {
                 k: v for k, v in state.items() if not k.startswith("temp:")
@@ -102,16 +198,11 @@ class FirestoreSessionService(BaseSessionService):
             filtered_state = {}
 
         await doc_ref.set(
-            {
-                "app_name": app_name,
-                "user_id": user_id,
-                "id": sid,
-                "state": filtered_state,
-                "create_time": now,
-                "update_time": now,
-                "ttl": now + timedelta(days=180),
-            }
+            self._new_session_doc(app_name, user_id, sid, filtered_state, now)
         )
+        # The document now exists, so an earlier failed create no longer applies
+        self._pending_creates.pop(doc_ref.id, None)
+        self._invalidate_list_cache(app_name, user_id)
 
         return Session(
             app_name=str(app_name),
@@ -130,26 +221,38 @@ class FirestoreSessionService(BaseSessionService):
         session_id: str,
         config: Optional[GetSessionConfig] = None,
     ) -> Optional[Session]:
-        doc_ref = self.col_sessions.document(f"{app_name}:{user_id}:{session_id}")
+        doc_ref = self._session_ref(app_name, user_id, session_id)
         snap = await doc_ref.get()
         if not snap.exists:
-            return await self.create_session(
-                app_name=app_name, user_id=user_id, session_id=session_id
+            # Single create RPC, fired without waiting: the new session is empty anyway
+            now = _now_utc()
+            session_doc = self._new_session_doc(app_name, user_id, session_id, {}, now)
+            task = asyncio.create_task(self._create_session_doc(doc_ref, session_doc))
+            self._pending_creates[doc_ref.id] = task
+            task.add_done_callback(partial(self._on_create_done, doc_ref.id))
+            self._invalidate_list_cache(app_name, user_id)
+            return Session(
+                app_name=str(app_name),
+                user_id=str(user_id),
+                id=str(session_id),
+                state={},
+                last_update_time=now.timestamp(),
             )
 
         data = snap.to_dict() or {}
-        update_ts = data.get("update_time", _now_utc()).timestamp()
+        update_dt: datetime = data.get("update_time") or _now_utc()
         session = Session(
             app_name=str(app_name),
             user_id=str(user_id),
             id=str(session_id),
             state=data.get("state", {}),
-            last_update_time=update_ts,
+            last_update_time=update_dt.timestamp(),
         )
 
-        # Load events from subcollection
-        events_col = doc_ref.collection("events")
-        query = events_col.order_by("timestamp")
+        # Load events from subcollection, keeping only events with ts <= update_time
+        # (Vertex parity). All filtering happens server side.
+        events_col = self._events_col(doc_ref.id)
+        query = events_col.where(filter=FieldFilter("timestamp", "<=", update_dt))
         if config and config.after_timestamp:
             query = query.where(
                 filter=FieldFilter(
@@ -159,24 +262,19 @@ class FirestoreSessionService(BaseSessionService):
                 )
             )
 
-        events_docs = [d async for d in query.stream()]
+        newest_first = bool(config and config.num_recent_events)
+        if newest_first:
+            query = query.order_by(
+                "timestamp", direction=firestore.Query.DESCENDING
+            ).limit(config.num_recent_events)
+        else:
+            query = query.order_by("timestamp")
+
         events: list[Event] = [
-            self._doc_to_event(d.to_dict() or {}) for d in events_docs
+            self._doc_to_event(d.to_dict() or {}) async for d in query.stream()
         ]
-
-        # Keep only events with ts <= update_time (Vertex parity)
-        events = [e for e in events if e.timestamp <= update_ts]
-
-        # Post-filtering like Vertex implementation
-        if config:
-            if config.num_recent_events:
-                events = events[-config.num_recent_events :]
-            elif config.after_timestamp:
-                i = len(events) - 1
-                while i >= 0 and events[i].timestamp >= config.after_timestamp:
-                    i -= 1
-                if i >= 0:
-                    events = events[i:]
+        if newest_first:
+            events.reverse()
 
         session.events = events
         return session
@@ -192,13 +290,20 @@ class FirestoreSessionService(BaseSessionService):
     ) -> tuple[ListSessionsResponse, str]:
         # Determine effective page size
         size = max(1, min(page_size, 50))
-
-        # Build base query (deterministic ordering)
+        cache_key = (app_name, user_id, size)
+        if not cursor:
+            cached = self._list_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        # Build base query (deterministic ordering). Served by the composite index
+        # declared in firestore.indexes.json; only the listed fields are returned.
         q = (
             self.col_sessions.where(filter=FieldFilter("app_name", "==", app_name))
             .where(filter=FieldFilter("user_id", "==", user_id))
             .order_by("update_time", direction=firestore.Query.DESCENDING)
             .order_by("id", direction=firestore.Query.ASCENDING)
+            .select(_LIST_SESSION_FIELDS)
         )
 
         # Apply cursor if provided
@@ -211,73 +316,91 @@ class FirestoreSessionService(BaseSessionService):
 
         # Page the results
         q = q.limit(size)
-        docs = [d async for d in q.stream()]
 
         sessions: list[Session] = []
-        for s in docs:
+        d: Dict[str, Any] = {}
+        async for s in q.stream():
             d = s.to_dict() or {}
+            # Firestore data was written by this service; skip re-validation
             sessions.append(
-                Session(
+                Session.model_construct(
                     app_name=app_name,
                     user_id=user_id,
                     id=str(d.get("id")),
-                    state=d.get("state", {}),
+                    state=d.get("state", {}) or {},
                     last_update_time=(d.get("update_time") or _now_utc()).timestamp(),
+                    events=[],
                 )
             )
 
         # Prepare next page token (if we returned a full page)
         next_page_token: Optional[str] = None
-        if len(docs) == size:
-            last_doc = docs[-1].to_dict() or {}
-            last_id = last_doc.get("id")
-            last_update_dt: datetime = last_doc.get("update_time") or _now_utc()
+        if len(sessions) == size:
+            # d still holds the last streamed document
+            last_id = d.get("id")
+            last_update_dt: datetime = d.get("update_time") or _now_utc()
             if last_id:
                 next_page_token = _encode_page_token(last_id, last_update_dt)
 
-        return ListSessionsResponse(sessions=sessions), next_page_token
+        result = ListSessionsResponse(sessions=sessions), next_page_token
+        if not cursor:
+            self._list_cache[cache_key] = result
+        return result
 
     @override
     async def delete_session(
         self, *, app_name: str, user_id: str, session_id: str
     ) -> None:
-        doc_ref = self.col_sessions.document(f"{app_name}:{user_id}:{session_id}")
-        # Delete events subcollection in batches
-        events_col = doc_ref.collection("events")
-        batch = self.client.batch()
-        # Stream then batch-delete
-        async for ev in events_col.stream():
-            batch.delete(ev.reference)
-        await batch.commit()
-        # Delete the session document
-        await doc_ref.delete()
+        doc_ref = self._session_ref(app_name, user_id, session_id)
+        # Delete events subcollection in batches; list_documents fetches only
+        # document names, not event bodies
+        events_col = self._events_col(doc_ref.id)
+        event_refs = [ref async for ref in events_col.list_documents()]
+        commits = []
+        for start in range(0, len(event_refs), _MAX_BATCH_WRITES):
+            batch = self.client.batch()
+            for ref in event_refs[start : start + _MAX_BATCH_WRITES]:
+                batch.delete(ref)
+            commits.append(batch.commit())
+        # Commit all batches and delete the session document concurrently
+        await asyncio.gather(*commits, doc_ref.delete())
+        self._invalidate_list_cache(app_name, user_id)
 
     @override
     async def append_event(self, session: Session, event: Event) -> Event:
         # Update in-memory first (BaseSessionService mutates session.state)
         await super().append_event(session=session, event=event)
 
-        doc_ref = self.col_sessions.document(
-            f"{session.app_name}:{session.user_id}:{session.id}"
-        )
-        events_col = doc_ref.collection("events")
+        doc_ref = self._session_ref(session.app_name, session.user_id, session.id)
+        events_col = self._events_col(doc_ref.id)
+        # The session update below fails if get_session's create has not landed
+        # yet; a failed create re-raises its original error here, once
+        pending_create = self._pending_creates.get(doc_ref.id)
+        if pending_create is not None:
+            try:
+                await pending_create
+            finally:
+                self._forget_pending_create(doc_ref.id, pending_create)
 
-        # Persist event document
+        # Persist event document and touch session's update_time and merged state
+        # in a single commit
         event_doc = self._event_to_doc(session, event)
-        await events_col.add(event_doc)
-
-        # Touch session's update_time and persist merged state
         now = _now_utc()
 
         filtered_state = {
             k: v for k, v in session.state.items() if not k.startswith("temp:")
         }
-        await doc_ref.update(
+        batch = self.client.batch()
+        batch.set(events_col.document(), event_doc)
+        batch.update(
+            doc_ref,
             {
                 "state": filtered_state,
                 "update_time": now,
-            }
+            },
         )
+        await batch.commit()
+        self._invalidate_list_cache(session.app_name, session.user_id)
 
         return event
 
@@ -285,9 +408,7 @@ class FirestoreSessionService(BaseSessionService):
         content_json = _safe_model_dump(event.content)
         grounding_json = _safe_model_dump(event.grounding_metadata)
 
-        actions_bytes: bytes | None = None
-        if event.actions is not None:
-            actions_bytes = pickle.dumps(event.actions)
+        actions_json = _safe_model_dump(event.actions)
 
         return {
             "id": event.id,
@@ -299,7 +420,7 @@ class FirestoreSessionService(BaseSessionService):
             "branch": event.branch,
             "timestamp": datetime.fromtimestamp(event.timestamp, tz=timezone.utc),
             "content": content_json,
-            "actions": actions_bytes,  # stored as bytes in Firestore
+            "actions": actions_json,  # stored as a native Firestore map
             "long_running_tool_ids": (
                 list(event.long_running_tool_ids)
                 if event.long_running_tool_ids
@@ -316,13 +437,17 @@ class FirestoreSessionService(BaseSessionService):
     def _doc_to_event(self, d: Dict[str, Any]) -> Event:
         actions_obj: EventActions | None = None
         raw_actions = d.get("actions")
-        if isinstance(raw_actions, (bytes, bytearray)):
+        if isinstance(raw_actions, dict):
             try:
-                actions_obj = pickle.loads(bytes(raw_actions))
+                actions_obj = EventActions.model_validate(raw_actions)
             except Exception:
                 actions_obj = None
+        elif isinstance(raw_actions, (bytes, bytearray)):
+            # Legacy pickled actions are deliberately never unpickled
+            self._warn_legacy_actions(d.get("session_id"))
 
-        return Event(
+        # Written by _event_to_doc, so skip re-validation
+        return Event.model_construct(
             id=d.get("id", ""),
             invocation_id=d.get("invocation_id", ""),
             author=d.get("author", ""),
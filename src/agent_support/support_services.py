@@ -1,9 +1,10 @@
-import json
 import logging
+import orjson
 import uuid
 
 from http import HTTPStatus
-from typing import Any, List, Optional, Union
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, Optional, Union
 
 from google.protobuf import struct_pb2 as _struct_pb2
 
@@ -25,138 +26,141 @@ from .storage import FirestoreSessionService
 
 logger = logging.getLogger(__name__)
 
+_JSON_OPENERS = ("{", "[")
+_SORT_KEY = itemgetter("sort_key")
+# Keys every streaming event carries (only final responses also carry "state")
+_STREAMING_EVENT_FIELDS = itemgetter(
+    "content", "type", "lastResponse", "agent", "function_name", "timestamp"
+)
+_STRUCT_TYPE = _struct_pb2.Struct
+_ROLE_USER = Role.user
+_ROLE_AGENT = Role.agent
+# Only events authored by "user" map to the user role; everything else is the agent
+_ROLE_MAP = {"user": _ROLE_USER}
+# Message metadata serialisers by exact type; anything else takes the slow path
+_META_HANDLERS = {
+    _STRUCT_TYPE: dict,
+    dict: lambda metadata: metadata,
+}
 
-def convert_session_to_streaming_events(session: Any) -> List[dict[str, Any]]:
+
+def _iter_streaming_events(session: Any) -> Iterator[dict[str, Any]]:
     """
-    Convert session events into the same format as the streaming response.
-    
-    This function transforms session events from Firestore into the format used
-    by the streaming API for consistency. Only agent responses are included
-    (user messages are filtered out).
-    
-    Args:
-        session: Session object with events and state
-        
-    Returns:
-        List of events in streaming format with keys:
-        - agent: event author
-        - type: "function_call", "function_response", "text", or "json"
-        - content: the actual content
-        - function_name: name of the function if applicable
-        - lastResponse: boolean (True for final response)
-        - state: current state (for final responses)
+    Yield session events in streaming format, one at a time. See
+    convert_session_to_streaming_events for the event format.
     """
-    events = session.events if hasattr(session, "events") else []
-    session_state = session.state if hasattr(session, "state") else {}
+    events = getattr(session, "events", None) or []
+    session_state = getattr(session, "state", None) or {}
     
-    streaming_events = []
+    # Bind names used in the per-event and per-part loops to locals to skip
+    # global lookups
+    _getattr = getattr
+    _loads = orjson.loads
+    _JSONDecodeError = orjson.JSONDecodeError
     
-    # Filter out user messages and track agent events only
+    # Single pass over the session: filter out user messages and keep a compact
+    # (author, parts, timestamp, is_partial) record per agent event, tracking the
+    # last event that updates data_analyst_response to mark it as final
     agent_events = []
+    last_data_analyst_event_idx = None
     for event in events:
-        author = getattr(event, "author", None)
-        if author:
-            agent_events.append(event)
+        author = _getattr(event, "author", None)
+        if not author:
+            continue
+        actions = _getattr(event, "actions", None)
+        state_delta = (
+            _getattr(actions, "state_delta", None) if actions is not None else None
+        )
+        if (
+            state_delta is not None
+            and type(state_delta) is dict
+            and "data_analyst_response" in state_delta
+        ):
+            last_data_analyst_event_idx = len(agent_events)
+        content = _getattr(event, "content", None)
+        agent_events.append(
+            (
+                author,
+                _getattr(content, "parts", None) if content else None,
+                _getattr(event, "timestamp", None),
+                _getattr(event, "partial", None) is True,
+            )
+        )
     
     if not agent_events:
-        return streaming_events
-    
-    # Track the last event that updates data_analyst_response to mark it as final
-    last_data_analyst_event_idx = None
-    for idx, event in enumerate(agent_events):
-        if hasattr(event, "actions") and event.actions:
-            # Try to access state_delta from EventActions
-            state_delta = None
-            if hasattr(event.actions, "state_delta"):
-                state_delta = event.actions.state_delta
-            elif hasattr(event.actions, "__dict__"):
-                state_delta = getattr(event.actions, "state_delta", None)
-            
-            if state_delta and isinstance(state_delta, dict):
-                if "data_analyst_response" in state_delta:
-                    last_data_analyst_event_idx = idx
+        return
     
     # If no data_analyst_response found, mark the last agent event as final
-    if last_data_analyst_event_idx is None and agent_events:
+    if last_data_analyst_event_idx is None:
         last_data_analyst_event_idx = len(agent_events) - 1
     
-    for idx, event in enumerate(agent_events):
-        if not hasattr(event, "content") or not event.content:
-            continue
-        if not hasattr(event.content, "parts") or not event.content.parts:
+    for idx, (author, parts, timestamp, is_partial) in enumerate(agent_events):
+        if not parts:
             continue
             
         is_final = (idx == last_data_analyst_event_idx)
-        author = getattr(event, "author", None)
         
-        for part in event.content.parts:
+        for part in parts:
+            function_call = _getattr(part, "function_call", None)
+            function_response = _getattr(part, "function_response", None)
+            text_content = _getattr(part, "text", None)
+            
             # Handle function calls
-            if hasattr(part, "function_call") and getattr(part, "function_call", None):
-                function_call = part.function_call
-                function_name = None
-                if hasattr(function_call, "name"):
-                    function_name = function_call.name
-                elif isinstance(function_call, dict):
+            if function_call:
+                if isinstance(function_call, dict):
                     function_name = function_call.get("name")
+                else:
+                    function_name = _getattr(function_call, "name", None)
                 
-                streaming_events.append({
+                yield {
                     "agent": author,
                     "type": "function_call",
                     "content": f"Running '{function_name}'...",
                     "function_name": function_name,
                     "lastResponse": False,
-                    "timestamp": getattr(event, "timestamp", None),
-                })
+                    "timestamp": timestamp,
+                }
             
             # Handle function responses
-            elif hasattr(part, "function_response") and getattr(part, "function_response", None):
-                function_response = part.function_response
-                function_name = None
-                if hasattr(function_response, "name"):
-                    function_name = function_response.name
-                elif isinstance(function_response, dict):
+            elif function_response:
+                if isinstance(function_response, dict):
                     function_name = function_response.get("name")
+                else:
+                    function_name = _getattr(function_response, "name", None)
                 
-                streaming_events.append({
+                yield {
                     "agent": author,
                     "type": "function_response",
                     "content": f"Finished running '{function_name}'.",
                     "function_name": function_name,
                     "lastResponse": False,
-                    "timestamp": getattr(event, "timestamp", None),
-                })
+                    "timestamp": timestamp,
+                }
             
             # Handle text content
-            elif hasattr(part, "text") and getattr(part, "text", None):
-                text_content = part.text
-                if not text_content:
-                    continue
-                
-                # Check if it's a partial/streaming response
-                is_partial = False
-                if hasattr(event, "partial"):
-                    partial_val = event.partial
-                    is_partial = partial_val is True
-                
+            elif text_content:
                 # For partial responses, yield as streaming text
                 if is_partial:
-                    streaming_events.append({
+                    yield {
                         "agent": author,
                         "type": "text",
                         "content": text_content,
                         "function_name": None,
                         "lastResponse": False,
-                        "timestamp": getattr(event, "timestamp", None),
-                    })
+                        "timestamp": timestamp,
+                    }
                 else:
-                    # For complete responses, try to parse as JSON
-                    try:
-                        parsed_content = json.loads(text_content)
-                        response_type = "json"
-                        final_content = parsed_content
-                    except (json.JSONDecodeError, TypeError, AttributeError):
-                        response_type = "text"
-                        final_content = text_content
+                    # For complete responses, try to parse JSON objects/arrays. Most
+                    # text is not JSON, so check the first character before paying
+                    # for a failed parse.
+                    response_type = "text"
+                    final_content = text_content
+                    if text_content.lstrip()[:1] in _JSON_OPENERS:
+                        try:
+                            final_content = _loads(text_content)
+                            response_type = "json"
+                        except _JSONDecodeError:
+                            pass
                     
                     # Build the response event
                     response_event = {
@@ -165,56 +169,145 @@ def convert_session_to_streaming_events(session: Any) -> List[dict[str, Any]]:
                         "content": final_content,
                         "function_name": None,
                         "lastResponse": is_final,
-                        "timestamp": getattr(event, "timestamp", None),
+                        "timestamp": timestamp,
                     }
                     
                     # Include state for final responses
                     if is_final:
                         response_event["state"] = session_state
                     
-                    streaming_events.append(response_event)
+                    yield response_event
+
+
+def convert_session_to_streaming_events(session: Any) -> List[dict[str, Any]]:
+    """
+    Convert session events into the same format as the streaming response.
     
-    return streaming_events
+    This function transforms session events from Firestore into the format used
+    by the streaming API for consistency. Only agent responses are included
+    (user messages are filtered out).
+    
+    Args:
+        session: Session object with events and state
+        
+    Returns:
+        List of events in streaming format with keys:
+        - agent: event author
+        - type: "function_call", "function_response", "text", or "json"
+        - content: the actual content
+        - function_name: name of the function if applicable
+        - lastResponse: boolean (True for final response)
+        - state: current state (for final responses)
+    """
+    return list(_iter_streaming_events(session))
 
 
 def _serialize_message(msg: Message) -> dict[str, Any]:
     """Serialize A2A Message to dictionary."""
+    role = getattr(msg, "role", None)
     result = {
-        "role": str(msg.role) if hasattr(msg, "role") else None,
-        "message_id": msg.message_id if hasattr(msg, "message_id") else None,
-        "task_id": msg.task_id if hasattr(msg, "task_id") else None,
-        "context_id": msg.context_id if hasattr(msg, "context_id") else None,
+        "role": str(role) if role is not None else None,
+        "message_id": getattr(msg, "message_id", None),
+        "task_id": getattr(msg, "task_id", None),
+        "context_id": getattr(msg, "context_id", None),
     }
     
     # Handle parts
-    if hasattr(msg, "parts") and msg.parts:
+    parts = getattr(msg, "parts", None)
+    if parts:
         parts_list = []
-        for part in msg.parts:
+        for part in parts:
             part_dict = {}
-            if hasattr(part, "root"):
-                root = part.root
-                if hasattr(root, "text") and root.text:
-                    part_dict["text"] = root.text
-                elif hasattr(root, "data") and root.data:
-                    part_dict["data"] = root.data
+            root = getattr(part, "root", None)
+            if root is not None:
+                text = getattr(root, "text", None)
+                if text:
+                    part_dict["text"] = text
+                else:
+                    data = getattr(root, "data", None)
+                    if data:
+                        part_dict["data"] = data
             parts_list.append(part_dict)
         result["parts"] = parts_list
-    elif hasattr(msg, "text") and msg.text:
-        result["text"] = msg.text
+    else:
+        text = getattr(msg, "text", None)
+        if text:
+            result["text"] = text
     
-    # Handle metadata (protobuf Struct)
-    if hasattr(msg, "metadata") and msg.metadata:
-        if isinstance(msg.metadata, _struct_pb2.Struct):
-            # Convert protobuf Struct to dict
-            result["metadata"] = dict(msg.metadata)
-        elif hasattr(msg.metadata, "__dict__"):
-            result["metadata"] = dict(msg.metadata.__dict__)
-        elif isinstance(msg.metadata, dict):
-            result["metadata"] = msg.metadata
+    # Handle metadata (protobuf Struct or dict)
+    metadata = getattr(msg, "metadata", None)
+    if metadata:
+        handler = _META_HANDLERS.get(type(metadata))
+        if handler is not None:
+            result["metadata"] = handler(metadata)
+        elif hasattr(metadata, "__dict__"):
+            result["metadata"] = dict(metadata.__dict__)
+        elif isinstance(metadata, dict):
+            result["metadata"] = metadata
     
     return result
 
 
+def _serialize_a2a_event_dict(event: dict[str, Any]) -> dict[str, Any]:
+    """Serialize a status update dict, converting nested A2A objects."""
+    result = {}
+    for key, value in event.items():
+        # Values are built by convert_streaming_events_to_a2a_format, so their
+        # exact types are known
+        value_type = type(value)
+        if key == "message" and value_type is Message:
+            result[key] = _serialize_message(value)
+        elif key == "state" and value_type is TaskState:
+            result[key] = value.name
+        else:
+            result[key] = value
+    return result
+
+
+def _serialize_a2a_event_tsu(event: TaskStatusUpdateEvent) -> dict[str, Any]:
+    """Serialize a TaskStatusUpdateEvent."""
+    status = event.status
+    state = status.state
+    result = {
+        "type": "task_status_update",
+        "status": {
+            "state": state.name if hasattr(state, "name") else str(state),
+        },
+        "final": event.final,
+        "context_id": event.context_id,
+        "task_id": event.task_id,
+    }
+    
+    # Serialize message
+    message = getattr(status, "message", None)
+    if message:
+        result["status"]["message"] = _serialize_message(message)
+    
+    return result
+
+
+def _serialize_a2a_event_fallback(event: Any) -> dict[str, Any]:
+    """Serialize subclasses of the known event types, or anything else, to a dict."""
+    if isinstance(event, dict):
+        return _serialize_a2a_event_dict(event)
+    elif isinstance(event, TaskStatusUpdateEvent):
+        return _serialize_a2a_event_tsu(event)
+    elif hasattr(event, "to_dict"):
+        return event.to_dict()
+    elif hasattr(event, "__dict__"):
+        return event.__dict__
+    else:
+        return {"error": "Unable to serialize event"}
+
+
+# A2A event serialisers by exact type: one dict lookup per event instead of an
+# isinstance ladder
+_SERIALIZERS = {
+    dict: _serialize_a2a_event_dict,
+    TaskStatusUpdateEvent: _serialize_a2a_event_tsu,
+}
+
+
 def _serialize_a2a_event(event: Union[TaskStatusUpdateEvent, dict[str, Any]]) -> dict[str, Any]:
     """
     Serialize A2A event to JSON-serializable dictionary.
@@ -225,48 +318,11 @@ def _serialize_a2a_event(event: Union[TaskStatusUpdateEvent, dict[str, Any]]) ->
     Returns:
         JSON-serializable dictionary representation
     """
-    if isinstance(event, dict):
-        # Already a dict, but need to serialize nested A2A objects
-        result = {}
-        for key, value in event.items():
-            if key == "message" and isinstance(value, Message):
-                result[key] = _serialize_message(value)
-            elif key == "state" and isinstance(value, TaskState):
-                result[key] = value.name if hasattr(value, "name") else str(value)
-            elif key == "metadata" and isinstance(value, _struct_pb2.Struct):
-                result[key] = dict(value)
-            else:
-                result[key] = value
-        return result
-    elif isinstance(event, TaskStatusUpdateEvent):
-        # Serialize TaskStatusUpdateEvent
-        result = {
-            "type": "task_status_update",
-            "status": {
-                "state": event.status.state.name if hasattr(event.status.state, "name") else str(event.status.state),
-            },
-            "final": event.final,
-            "context_id": event.context_id,
-            "task_id": event.task_id,
-        }
-        
-        # Serialize message
-        if hasattr(event.status, "message") and event.status.message:
-            result["status"]["message"] = _serialize_message(event.status.message)
-        
-        return result
-    else:
-        # Fallback: try to convert to dict
-        if hasattr(event, "to_dict"):
-            return event.to_dict()
-        elif hasattr(event, "__dict__"):
-            return event.__dict__
-        else:
-            return {"error": "Unable to serialize event"}
+    return _SERIALIZERS.get(type(event), _serialize_a2a_event_fallback)(event)
 
 
 def convert_streaming_events_to_a2a_format(
-    streaming_events: List[dict[str, Any]], 
+    streaming_events: Iterable[dict[str, Any]], 
     context_id: str,
     task_id: Optional[str] = None
 ) -> List[Union[TaskStatusUpdateEvent, dict[str, Any]]]:
@@ -277,7 +333,8 @@ def convert_streaming_events_to_a2a_format(
     matches what the agent executor produces. Uses actual A2A types.
     
     Args:
-        streaming_events: List of streaming events from convert_session_to_streaming_events
+        streaming_events: Streaming events from convert_session_to_streaming_events;
+            every event must carry all of its keys
         context_id: Session/context ID for the messages
         task_id: Optional task ID for the messages
         
@@ -292,22 +349,40 @@ def convert_streaming_events_to_a2a_format(
     
     # Store events with their timestamps for sorting
     events_with_timestamps = []
+    # Bind names used in the per-event loop to locals to skip global lookups
+    _append = events_with_timestamps.append
+    _uuid4 = uuid.uuid4
+    _role_for = _ROLE_MAP.get
+    _unpack_event = _STREAMING_EVENT_FIELDS
+    _task_state_working = TaskState.working
+    # Latest timestamp among appended events, for the final status update
+    last_ts = None
+    # Sort keys are computed once per event (None timestamps go last); events
+    # usually arrive in order, in which case the final sort is skipped
+    _inf = float("inf")
+    prev_sort_key = -_inf
+    is_sorted = True
     seq = 0
     for event in streaming_events:
-        seq = int(seq + 1)
-        if not event.get("content"):
+        seq += 1
+        (
+            content,
+            event_type,
+            last_response,
+            agent,
+            function_name,
+            timestamp,
+        ) = _unpack_event(event)
+        if not content:
             continue
         
-        event_type = event.get("type")
-        last_response = event.get("lastResponse", False)
-        agent = event.get("agent")
-        content = event.get("content")
-        function_name = event.get("function_name")
-        timestamp = event.get("timestamp")
-        role = Role.user if agent == "user" else Role.agent
-        
-        # Generate message ID for each event
-        message_id = str(uuid.uuid4())
+        if timestamp is not None and (last_ts is None or timestamp > last_ts):
+            last_ts = timestamp
+        sort_key = _inf if timestamp is None else timestamp
+        if sort_key < prev_sort_key:
+            is_sorted = False
+        prev_sort_key = sort_key
+        role = _role_for(agent, _ROLE_AGENT)
         
         if last_response:
             # For lastResponse events, create message with metadata
@@ -322,7 +397,7 @@ def convert_streaming_events_to_a2a_format(
                 message = Message(
                     role=role,
                     parts=[Part(root=DataPart(data=content))],
-                    message_id=message_id,
+                    message_id=str(_uuid4()),
                     task_id=task_id,
                     context_id=context_id,
                 )
@@ -343,32 +418,31 @@ def convert_streaming_events_to_a2a_format(
             }
             
             # Store as dict for JSON serialization (matching updater.update_status pattern)
-            events_with_timestamps.append({
+            _append({
                 "event": {
                     "type": "status_update",
-                    "state": TaskState.working,
+                    "state": _task_state_working,
                     "message": message,
                     "metadata": metadata,
                 },
                 "timestamp": timestamp,
+                "sort_key": sort_key,
             })
             
             # Store state if present for final status update
             if "state" in event:
                 final_state = event["state"]
         else:
-            # For partial/streaming responses, create TaskStatusUpdateEvent
-            metadata = _struct_pb2.Struct()
-            metadata.update(
-                {
-                    "type": event_type,
-                    "lastResponse": last_response,
-                    "finished": False,
-                    "agent": agent,
-                    "function_name": function_name,
-                    "sequenceNo": seq,
-                }
-            )
+            # For partial/streaming responses, create TaskStatusUpdateEvent.
+            # Message.metadata is a plain dict, so there is no need for a Struct.
+            metadata = {
+                "type": event_type,
+                "lastResponse": last_response,
+                "finished": False,
+                "agent": agent,
+                "function_name": function_name,
+                "sequenceNo": seq,
+            }
             
             # Create parts based on type
             if event_type == "json":
@@ -379,16 +453,16 @@ def convert_streaming_events_to_a2a_format(
             message = Message(
                 role=role,
                 parts=parts,
-                message_id=message_id,
+                message_id=str(_uuid4()),
                 task_id=task_id,
                 context_id=context_id,
                 metadata=metadata,
             )
             
-            events_with_timestamps.append({
+            _append({
                 "event": TaskStatusUpdateEvent(
                     status=TaskStatus(
-                        state=TaskState.working,
+                        state=_task_state_working,
                         message=message,
                     ),
                     final=False,
@@ -396,6 +470,7 @@ def convert_streaming_events_to_a2a_format(
                     task_id=task_id,
                 ),
                 "timestamp": timestamp,
+                "sort_key": sort_key,
             })
     
     # Add final status update if we have state (matching the executor's final update)
@@ -412,18 +487,12 @@ def convert_streaming_events_to_a2a_format(
             "lastResponse": True,
             "turnComplete": True,
             "agent": "Orchestrator",
-            "sequenceNo": int(seq + 1),
+            "sequenceNo": seq + 1,
         }
         
-        # Use the last timestamp from events, or None if no events
-        final_timestamp = (
-            max(
-                (e["timestamp"] for e in events_with_timestamps if e["timestamp"] is not None),
-                default=None
-            )
-            if events_with_timestamps
-            else None
-        )
+        final_sort_key = _inf if last_ts is None else last_ts
+        if final_sort_key < prev_sort_key:
+            is_sorted = False
         
         events_with_timestamps.append({
             "event": {
@@ -432,18 +501,14 @@ def convert_streaming_events_to_a2a_format(
                 "message": final_message,
                 "metadata": final_metadata,
             },
-            "timestamp": final_timestamp,
+            # Use the last timestamp from events, or None if no events
+            "timestamp": last_ts,
+            "sort_key": final_sort_key,
         })
     
-    # Sort events by timestamp (ascending order), handling None timestamps
-    def get_sort_key(item: dict[str, Any]) -> float:
-        timestamp = item.get("timestamp")
-        if timestamp is None:
-            # Put None timestamps at the end
-            return float('inf')
-        return float(timestamp)
-    
-    events_with_timestamps.sort(key=get_sort_key)
+    # Sort events by timestamp (ascending order), None timestamps at the end
+    if not is_sorted:
+        events_with_timestamps.sort(key=_SORT_KEY)
     
     # Extract just the events in sorted order
     a2a_events = [item["event"] for item in events_with_timestamps]
@@ -451,6 +516,33 @@ def convert_streaming_events_to_a2a_format(
     return a2a_events
 
 
+def convert_session_to_a2a_events(
+    session: Any,
+    context_id: str,
+    task_id: Optional[str] = None
+) -> List[Union[TaskStatusUpdateEvent, dict[str, Any]]]:
+    """
+    Convert session events straight to A2A format.
+    
+    Equivalent to convert_streaming_events_to_a2a_format applied to the output of
+    convert_session_to_streaming_events, but streaming events are produced and
+    consumed one at a time instead of being collected into an intermediate list.
+    
+    Args:
+        session: Session object with events and state
+        context_id: Session/context ID for the messages
+        task_id: Optional task ID for the messages
+        
+    Returns:
+        List of A2A-formatted events with TaskStatusUpdateEvent and status update dicts
+    """
+    return convert_streaming_events_to_a2a_format(
+        streaming_events=_iter_streaming_events(session),
+        context_id=context_id,
+        task_id=task_id,
+    )
+
+
 class AgentSupportService:
     def __init__(self):
         self.app_name = ServiceConfig.get_or_create_instance().appName
@@ -471,15 +563,13 @@ class AgentSupportService:
             user_id=user_id,
             session_id=session_id,
         )
-        # Convert session events into streaming format
-        streaming_events = convert_session_to_streaming_events(session)
-        # Convert streaming events to A2A format
-        a2a_events = convert_streaming_events_to_a2a_format(
-            streaming_events=streaming_events,
-            context_id=session_id,
-        )
-        # Serialize A2A events to JSON-serializable format
-        serialized_events = [_serialize_a2a_event(event) for event in a2a_events]
+        # New and empty sessions have nothing to convert
+        serialized_events = []
+        if getattr(session, "events", None):
+            # Convert session events into A2A format (via the streaming format)
+            a2a_events = convert_session_to_a2a_events(session, context_id=session_id)
+            # Serialize A2A events to JSON-serializable format
+            serialized_events = [_serialize_a2a_event(event) for event in a2a_events]
 
         return {
             "id": session.id if hasattr(session, "id") else session_id,
@@ -9,6 +9,7 @@ from .exceptions import (
     UnauthorisedRequest,
 )
 from .constants import Constants
+from .file_cache import source_mtimes, read_mtime_cache, write_mtime_cache
 
 __all__ = [
     "EnvironmentVariableNotFound",
@@ -20,4 +21,7 @@ __all__ = [
     "FailureDuringCompaction",
     "UnauthorisedRequest",
     "Constants",
+    "source_mtimes",
+    "read_mtime_cache",
+    "write_mtime_cache",
 ]
@@ -1,60 +1,70 @@
-class EnvironmentVariableNotFound(Exception):
+# Fixed message prefixes; only the variable part is formatted at raise time
+_ASE000 = "[ASE:000] Environment variable $"
+_ASE001 = "[ASE:001] Object does not exist: "
+_ASE002 = "[ASE:002] Unable to fetch market insights from persistence: "
+_ASE003 = "[ASE:003] Unable to find session for user: "
+_ASE004 = (
+    "[ASE:004] user_id is required but not provided in request metadata. "
+    "Either authenticate or interact in dev mode"
+)
+_ASE005 = "[ASE:005] Authorization token in header is missing"
+_ASE006 = "[ASE:006] "
+_ASE007 = "[ASE:007] Invalid SQL WHERE conditions: "
+_ASE008 = "[ASE:008] Oops! "
+_ASE009 = "[ASE:009] Unauthorised Request. "
+
+
+class AgentSupportException(Exception):
+    @property
+    def message(self) -> str:
+        return self.args[0]
+
+
+class EnvironmentVariableNotFound(AgentSupportException):
     def __init__(self, env_var_name: str):
-        self.message = f"[ASE:000] Environment variable ${env_var_name} not found"
-        super().__init__(self.message)
+        super().__init__(_ASE000 + str(env_var_name) + " not found")
 
 
-class PersistenceObjectDoesNotExist(Exception):
+class PersistenceObjectDoesNotExist(AgentSupportException):
     def __init__(self, e: str):
-        self.message = f"[ASE:001] Object does not exist: {e}"
-        super().__init__(self.message)
+        super().__init__(_ASE001 + str(e))
 
 
-class UnableToFetchTaskLookupFromPersistence(Exception):
+class UnableToFetchTaskLookupFromPersistence(AgentSupportException):
     def __init__(self, e: str):
-        self.message = (
-            f"[ASE:002] Unable to fetch market insights from persistence: {e}"
-        )
-        super().__init__(self.message)
+        super().__init__(_ASE002 + str(e))
 
 
-class SessionNotFoundForUser(Exception):
+class SessionNotFoundForUser(AgentSupportException):
     def __init__(self, e: str):
-        self.message = f"[ASE:003] Unable to find session for user: {e}"
-        super().__init__(self.message)
+        super().__init__(_ASE003 + str(e))
 
 
-class MissingUserIdError(Exception):
+class MissingUserIdError(AgentSupportException):
     def __init__(self):
-        self.message = "[ASE:004] user_id is required but not provided in request metadata. Either authenticate or interact in dev mode"
-        super().__init__(self.message)
+        super().__init__(_ASE004)
 
 
-class AuthorisationTokenMissing(Exception):
+class AuthorisationTokenMissing(AgentSupportException):
     def __init__(self):
-        self.message = "[ASE:005] Authorization token in header is missing"
-        super().__init__(self.message)
+        super().__init__(_ASE005)
 
 
-class UnableToAuthenticateToken(Exception):
+class UnableToAuthenticateToken(AgentSupportException):
     def __init__(self, message: str):
-        self.message = f"[ASE:006] {message}"
-        super().__init__(self.message)
+        super().__init__(_ASE006 + str(message))
 
 
-class InvalidWhereConditions(Exception):
+class InvalidWhereConditions(AgentSupportException):
     def __init__(self, conditions: str):
-        self.message = f"[ASE:007] Invalid SQL WHERE conditions: {conditions}"
-        super().__init__(self.message)
+        super().__init__(_ASE007 + str(conditions))
 
 
-class FailureDuringCompaction(Exception):
+class FailureDuringCompaction(AgentSupportException):
     def __init__(self, message: str):
-        self.message = f"[ASE:008] Oops! {message}"
-        super().__init__(self.message)
+        super().__init__(_ASE008 + str(message))
 
 
-class UnauthorisedRequest(Exception):
+class UnauthorisedRequest(AgentSupportException):
     def __init__(self, message: str):
-        self.message = f"[ASE:009] Unauthorised Request. {message}"
-        super().__init__(self.message)
+        super().__init__(_ASE009 + str(message))
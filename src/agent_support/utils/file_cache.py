@@ -0,0 +1,46 @@
+import json
+import logging
+import os
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def source_mtimes(*paths: str) -> list[float]:
+    """
+    Returns the modification times of the given source files, in order.
+
+    :raises FileNotFoundError: Raised if any of the paths does not exist.
+    """
+    return [os.stat(path).st_mtime for path in paths]
+
+
+def read_mtime_cache(cache_path: str, mtimes: list[float]) -> Optional[Any]:
+    """
+    Reads a JSON cache written by ``write_mtime_cache``. The cached data is only
+    returned when it was produced from sources with exactly the given mtimes.
+
+    :param cache_path: Path of the JSON cache file.
+    :param mtimes: Current modification times of the cached sources.
+    :return: The cached data, or ``None`` if the cache is missing or stale.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("mtimes") != mtimes:
+        return None
+    return cached.get("data")
+
+
+def write_mtime_cache(cache_path: str, mtimes: list[float], data: Any) -> None:
+    """
+    Writes ``data`` to a JSON cache tagged with the mtimes of its sources. Failing
+    to write (e.g. on a read-only filesystem) is logged and otherwise ignored.
+    """
+    try:
+        with open(cache_path, "w", encoding="utf-8") as f:
+            json.dump({"mtimes": mtimes, "data": data}, f)
+    except (OSError, TypeError) as e:
+        logger.warning("Unable to write cache %s: %s", cache_path, e)